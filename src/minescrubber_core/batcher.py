@@ -0,0 +1,485 @@
+import random
+
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+from . import boarder
+from . import cellar
+from . import gamer
+
+
+ACTION = gamer.ACTION
+
+# Observation codes, uncovered cells show their hint (0-8) or `MINE_INT`
+COVERED_INT = 9
+FLAGGED_INT = 10
+
+_COVERED = cellar.CELL_STATE.covered.value
+_UNCOVERED = cellar.CELL_STATE.uncovered.value
+_FLAGGED = cellar.CELL_STATE.flagged.value
+
+_OFFSETS = [
+    (dx, dy)
+    for dx in (-1, 0, 1)
+    for dy in (-1, 0, 1)
+    if (dx, dy) != (0, 0)
+]
+
+
+def cell_code(cell):
+    if cell.is_uncovered:
+        return cellar.MINE_INT if cell.has_mine else cell.hint
+    elif cell.is_flagged:
+        return FLAGGED_INT
+    return COVERED_INT
+
+
+def observe_board(board):
+    return [
+        [cell_code(board.get_cell((x, y))) for x in range(board.width)]
+        for y in range(board.height)
+    ]
+
+
+class BatchBoard:
+    REWARD_SOLVED = 1.0
+    REWARD_OVER = -1.0
+    REWARD_STEP = 0.0
+
+    def __init__(self, nb_boards, width=9, height=9, nb_mines=10,
+                 auto_reset=True, seed=None, use_numpy=None):
+        boarder.Board._validate_args(
+            width=width,
+            height=height,
+            nb_mines=nb_mines
+        )
+        if nb_boards < 1:
+            error_msg = f'No. of boards={nb_boards} should be at least 1'
+            raise RuntimeError(error_msg)
+
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            error_msg = 'NumPy is not available, use `use_numpy=False`'
+            raise RuntimeError(error_msg)
+
+        self._nb_boards = nb_boards
+        self._width = width
+        self._height = height
+        self._nb_slots = width * height
+        self._nb_mines = nb_mines
+        self._nb_actions = len(ACTION) * self._nb_slots
+        self._auto_reset = auto_reset
+        self._use_numpy = use_numpy
+
+        self._neighbours = boarder._flat_neighbour_table(width, height)
+
+        if self._use_numpy:
+            self._rng = np.random.default_rng(seed)
+            self._init_numpy()
+        else:
+            self._rng = random.Random(seed)
+            self._init_python()
+
+        self.reset()
+
+    @property
+    def nb_boards(self):
+        return self._nb_boards
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def nb_slots(self):
+        return self._nb_slots
+
+    @property
+    def nb_mines(self):
+        return self._nb_mines
+
+    @property
+    def nb_actions(self):
+        return self._nb_actions
+
+    @property
+    def uses_numpy(self):
+        return self._use_numpy
+
+    @property
+    def dones(self):
+        return [
+            bool(over or solved)
+            for over, solved in zip(self._over, self._solved)
+        ]
+
+    @property
+    def outcomes(self):
+        return [
+            gamer.OUTCOME.over if over
+            else gamer.OUTCOME.solved if solved
+            else gamer.OUTCOME.playing
+            for over, solved in zip(self._over, self._solved)
+        ]
+
+    @property
+    def observations(self):
+        if self._use_numpy:
+            return self._observe_numpy()
+        return self._observe_python()
+
+    def encode_action(self, action, slot):
+        x, y = slot
+        return action.value * self._nb_slots + self._to_index(x, y)
+
+    def decode_action(self, code):
+        action = ACTION(code // self._nb_slots)
+        return action, self._to_slot(code % self._nb_slots)
+
+    def reset(self, indices=None):
+        if indices is None:
+            indices = range(self._nb_boards)
+
+        indices = list(indices)
+        if not indices:
+            return
+
+        if self._use_numpy:
+            self._reset_numpy(indices)
+        else:
+            self._reset_python(indices)
+
+    def set_mines(self, index, mine_slots):
+        mine_slots = list(mine_slots)
+        is_distinct = len(set(mine_slots)) == len(mine_slots)
+        if len(mine_slots) != self._nb_mines or not is_distinct:
+            error_msg = (
+                f'Expected {self._nb_mines} distinct mines, got {mine_slots}'
+            )
+            raise ValueError(error_msg)
+
+        mine_indices = [self._to_index(x, y) for x, y in mine_slots]
+        if self._use_numpy:
+            self._load_numpy(index, mine_indices)
+        else:
+            self._load_python(index, mine_indices)
+
+    def step(self, actions):
+        if self._use_numpy:
+            actions = np.asarray(actions, dtype=np.int64).ravel()
+        else:
+            actions = list(actions)
+
+        if len(actions) != self._nb_boards:
+            error_msg = (
+                f'Expected {self._nb_boards} actions, got {len(actions)}'
+            )
+            raise ValueError(error_msg)
+
+        if min(actions) < 0 or max(actions) >= self._nb_actions:
+            code = next(
+                code for code in actions
+                if not 0 <= code < self._nb_actions
+            )
+            error_msg = (
+                f'The action<{code}> is not in range '
+                f'[0, {self._nb_actions})'
+            )
+            raise ValueError(error_msg)
+
+        if self._use_numpy:
+            rewards, dones = self._step_numpy(actions)
+        else:
+            rewards, dones = self._step_python(actions)
+
+        if self._auto_reset:
+            self.reset([index for index, done in enumerate(dones) if done])
+
+        return self.observations, rewards, dones
+
+    def _to_index(self, x, y):
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            error_msg = (
+                f'The slot<{(x, y)}> is not on board: '
+                f'{self._width} x {self._height}'
+            )
+            raise ValueError(error_msg)
+        return y * self._width + x
+
+    def _to_slot(self, index):
+        return (index % self._width, index // self._width)
+
+    # Pure python storage, one flat list per board
+
+    def _init_python(self):
+        size = self._nb_slots
+        self._mines = [[False] * size for _ in range(self._nb_boards)]
+        self._hints = [[0] * size for _ in range(self._nb_boards)]
+        self._states = [[_COVERED] * size for _ in range(self._nb_boards)]
+        self._swept = [[False] * size for _ in range(self._nb_boards)]
+        self._nb_flagged = [0] * self._nb_boards
+        self._over = [False] * self._nb_boards
+        self._solved = [False] * self._nb_boards
+
+    def _reset_python(self, indices):
+        for index in indices:
+            random_indices = list(range(self._nb_slots))
+            self._rng.shuffle(random_indices)
+            self._load_python(index, random_indices[:self._nb_mines])
+
+    def _load_python(self, index, mine_indices):
+        size = self._nb_slots
+        mines = [False] * size
+        for mine_index in mine_indices:
+            mines[mine_index] = True
+
+        hints = []
+        for cell_index in range(size):
+            if mines[cell_index]:
+                hints.append(cellar.MINE_INT)
+                continue
+            hints.append(
+                sum(mines[adj] for adj in self._neighbours[cell_index])
+            )
+
+        self._mines[index] = mines
+        self._hints[index] = hints
+        self._states[index] = [_COVERED] * size
+        self._swept[index] = [False] * size
+        self._nb_flagged[index] = 0
+        self._over[index] = False
+        self._solved[index] = False
+
+    def _step_python(self, actions):
+        rewards = [self.REWARD_STEP] * self._nb_boards
+        for index, code in enumerate(actions):
+            if self._over[index] or self._solved[index]:
+                continue
+
+            cell_index = code % self._nb_slots
+            if code // self._nb_slots == ACTION.select.value:
+                if self._mines[index][cell_index]:
+                    self._over[index] = True
+                    self._states[index] = [_UNCOVERED] * self._nb_slots
+                    rewards[index] = self.REWARD_OVER
+                    continue
+                self._sweep_python(index, cell_index)
+            else:
+                self._flag_python(index, cell_index)
+
+            nb_hidden = sum(
+                state != _UNCOVERED for state in self._states[index]
+            )
+            if nb_hidden == self._nb_mines:
+                self._solved[index] = True
+                rewards[index] = self.REWARD_SOLVED
+
+        return rewards, self.dones
+
+    def _flag_python(self, index, cell_index):
+        states = self._states[index]
+        state = states[cell_index]
+        if state == _FLAGGED:
+            states[cell_index] = _COVERED
+            self._nb_flagged[index] -= 1
+        elif state == _COVERED:
+            if self._nb_flagged[index] == self._nb_mines:
+                return
+            states[cell_index] = _FLAGGED
+            self._nb_flagged[index] += 1
+
+    def _sweep_python(self, index, cell_index):
+        states = self._states[index]
+        swept = self._swept[index]
+        hints = self._hints[index]
+
+        stack = [cell_index]
+        while stack:
+            current = stack.pop()
+            if states[current] != _FLAGGED:
+                states[current] = _UNCOVERED
+            swept[current] = True
+
+            if hints[current] != 0:
+                continue
+
+            for adj in self._neighbours[current]:
+                if not swept[adj]:
+                    swept[adj] = True
+                    stack.append(adj)
+
+    def _observe_python(self):
+        observations = []
+        for hints, states in zip(self._hints, self._states):
+            codes = [
+                hint if state == _UNCOVERED
+                else FLAGGED_INT if state == _FLAGGED
+                else COVERED_INT
+                for hint, state in zip(hints, states)
+            ]
+            observations.append([
+                codes[y * self._width:(y + 1) * self._width]
+                for y in range(self._height)
+            ])
+        return observations
+
+    # NumPy storage, stacked (nb_boards, nb_slots) arrays
+
+    def _init_numpy(self):
+        shape = (self._nb_boards, self._nb_slots)
+        self._mines = np.zeros(shape, dtype=bool)
+        self._hints = np.zeros(shape, dtype=np.int8)
+        self._zeros = np.zeros(shape, dtype=bool)
+        self._states = np.full(shape, _COVERED, dtype=np.int8)
+        self._swept = np.zeros(shape, dtype=bool)
+        self._nb_flagged = np.zeros(self._nb_boards, dtype=np.int32)
+        self._over = np.zeros(self._nb_boards, dtype=bool)
+        self._solved = np.zeros(self._nb_boards, dtype=bool)
+
+    def _reset_numpy(self, indices):
+        indices = np.asarray(indices)
+        keys = self._rng.random((len(indices), self._nb_slots))
+        mine_indices = np.argsort(keys, axis=1)[:, :self._nb_mines]
+        mines = np.zeros((len(indices), self._nb_slots), dtype=bool)
+        np.put_along_axis(mines, mine_indices, True, axis=1)
+        self._load_numpy(indices, mines=mines)
+
+    def _load_numpy(self, indices, mine_indices=None, mines=None):
+        indices = np.atleast_1d(indices)
+        if mines is None:
+            mines = np.zeros((1, self._nb_slots), dtype=bool)
+            mines[0, mine_indices] = True
+
+        hints = self._count_neighbours(mines).astype(np.int8)
+        hints[mines] = cellar.MINE_INT
+
+        self._mines[indices] = mines
+        self._hints[indices] = hints
+        self._zeros[indices] = hints == 0
+        self._states[indices] = _COVERED
+        self._swept[indices] = False
+        self._nb_flagged[indices] = 0
+        self._over[indices] = False
+        self._solved[indices] = False
+
+    def _step_numpy(self, actions):
+        kinds = actions // self._nb_slots
+        cell_indices = actions % self._nb_slots
+        boards = np.arange(self._nb_boards)
+        active = ~(self._over | self._solved)
+        rewards = np.full(self._nb_boards, self.REWARD_STEP)
+
+        flag = active & (kinds == ACTION.flag.value)
+        if flag.any():
+            self._flag_numpy(boards[flag], cell_indices[flag])
+
+        select = active & (kinds == ACTION.select.value)
+        if select.any():
+            rows = boards[select]
+            columns = cell_indices[select]
+            hit = self._mines[rows, columns]
+
+            lost = rows[hit]
+            self._over[lost] = True
+            self._states[lost] = _UNCOVERED
+            rewards[lost] = self.REWARD_OVER
+
+            self._sweep_numpy(rows[~hit], columns[~hit])
+
+        playing = active & ~self._over
+        nb_hidden = (self._states != _UNCOVERED).sum(axis=1)
+        solved = playing & (nb_hidden == self._nb_mines)
+        self._solved |= solved
+        rewards[solved] = self.REWARD_SOLVED
+
+        return rewards.tolist(), (self._over | self._solved).tolist()
+
+    def _flag_numpy(self, rows, columns):
+        states = self._states[rows, columns]
+
+        unflag = states == _FLAGGED
+        self._states[rows[unflag], columns[unflag]] = _COVERED
+        self._nb_flagged[rows[unflag]] -= 1
+
+        flag = (states == _COVERED) & (self._nb_flagged[rows] < self._nb_mines)
+        self._states[rows[flag], columns[flag]] = _FLAGGED
+        self._nb_flagged[rows[flag]] += 1
+
+    def _sweep_numpy(self, rows, columns):
+        if not len(rows):
+            return
+
+        # Flood one ring of each opening per iteration, only over the
+        # boards whose opening is still growing
+        swept = self._swept[rows]
+        states = self._states[rows]
+        zeros = self._zeros[rows]
+
+        flooding = np.arange(len(rows))
+        frontier = np.zeros_like(swept)
+        frontier[flooding, columns] = True
+        while len(flooding):
+            swept[flooding] |= frontier
+            flooding_states = states[flooding]
+            flooding_states[
+                frontier & (flooding_states != _FLAGGED)
+            ] = _UNCOVERED
+            states[flooding] = flooding_states
+
+            frontier = self._dilate(frontier & zeros[flooding])
+            frontier &= ~swept[flooding]
+            growing = frontier.any(axis=1)
+            flooding = flooding[growing]
+            frontier = frontier[growing]
+
+        self._swept[rows] = swept
+        self._states[rows] = states
+
+    def _observe_numpy(self):
+        codes = np.where(
+            self._states == _UNCOVERED,
+            self._hints,
+            np.where(self._states == _FLAGGED, FLAGGED_INT, COVERED_INT),
+        ).astype(np.int8)
+        return codes.reshape(self._nb_boards, self._height, self._width)
+
+    def _shifted(self, mask):
+        grid = mask.reshape(-1, self._height, self._width)
+        padded = np.zeros(
+            (grid.shape[0], self._height + 2, self._width + 2),
+            dtype=grid.dtype,
+        )
+        padded[:, 1:-1, 1:-1] = grid
+        for dx, dy in _OFFSETS:
+            yield padded[
+                :,
+                1 + dy:1 + dy + self._height,
+                1 + dx:1 + dx + self._width,
+            ]
+
+    def _dilate(self, mask):
+        out = np.zeros(
+            (mask.shape[0], self._height, self._width),
+            dtype=bool,
+        )
+        for shifted in self._shifted(mask):
+            out |= shifted
+        return out.reshape(mask.shape)
+
+    def _count_neighbours(self, mask):
+        out = np.zeros(
+            (mask.shape[0], self._height, self._width),
+            dtype=np.int8,
+        )
+        for shifted in self._shifted(mask):
+            out += shifted
+        return out.reshape(mask.shape)
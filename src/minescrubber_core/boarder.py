@@ -1,15 +1,26 @@
+import collections
+import functools
 import os
 import random
+import struct
 
 
 from . import cellar
 
 
+_SNAPSHOT_HEADER = struct.Struct('>BBHHH')
+_SNAPSHOT_SLOT = struct.Struct('>BB')
+
+_STATE_MASK = 0b0011
+_SWEPT_BIT = 0b0100
+_MINE_BIT = 0b1000
+
+
 class Board:
     MIN_CELLS = 5
     MAX_CELLS = 16
 
-    def __init__(self, width=9, height=9, nb_mines=10):
+    def __init__(self, width=9, height=9, nb_mines=10, mine_slots=None):
         self._validate_args(
             width=width,
             height=height,
@@ -17,9 +28,14 @@ class Board:
         )
 
         self._dev_env = os.environ.get('MINESCRUBBER_DEV')
-        self.init_board(width=width, height=height, nb_mines=nb_mines)
+        self.init_board(
+            width=width,
+            height=height,
+            nb_mines=nb_mines,
+            mine_slots=mine_slots,
+        )
 
-    def init_board(self, width, height, nb_mines):
+    def init_board(self, width, height, nb_mines, mine_slots=None):
         self._width = width
         self._height = height
 
@@ -32,13 +48,20 @@ class Board:
         self._nb_slots = self._width * self._height
         self._nb_mines = nb_mines
 
+        self._neighbours = _neighbour_table(self._width, self._height)
+
         self._mine_slots = None
+        if mine_slots is not None:
+            self._mine_slots = list(mine_slots)
         self._data = self._generate_board_data()
 
         self._swept_slots = []
         self._flagged_slots = []
         self._last_swept = []
 
+        self._metrics = None
+        self._build_indexes()
+
     @property
     def minimum_nb_cells(self):
         return self._minimum_nb_cells
@@ -77,7 +100,12 @@ class Board:
 
     @property
     def covered_slots(self):
-        return sorted([cell.slot for cell in self.cells if cell.is_covered])
+        return self.find_slots(state=cellar.CELL_STATE.covered)
+
+    @property
+    def frontier_slots(self):
+        # Uncovered numbered cells bordering at least one covered cell
+        return sorted(self._frontier)
 
     @property
     def cells(self):
@@ -119,9 +147,101 @@ class Board:
     def last_swept(self):
         return self._last_swept
 
+    @property
+    def metrics(self):
+        if self._metrics is None:
+            from . import grader
+            self._metrics = grader.measure(self)
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics):
+        # Lets `grader.measure_pool` cache metrics measured elsewhere,
+        # `init_board` clears them again
+        self._metrics = metrics
+
+    def snapshot(self):
+        # One byte per cell (state, swept, mine) followed by the flagged
+        # and last swept slots, kept as lists since `uncover_all` leaves
+        # flagged slots behind
+        swept_slots = set(self._swept_slots)
+        cell_bytes = bytearray()
+        for y in range(self._height):
+            for x in range(self._width):
+                cell = self._data[(x, y)]
+                value = cell.state.value
+                if cell.slot in swept_slots:
+                    value |= _SWEPT_BIT
+                if cell.has_mine:
+                    value |= _MINE_BIT
+                cell_bytes.append(value)
+
+        header = _SNAPSHOT_HEADER.pack(
+            self._width,
+            self._height,
+            self._nb_mines,
+            len(self._flagged_slots),
+            len(self._last_swept),
+        )
+        slots = b''.join(
+            _SNAPSHOT_SLOT.pack(*slot)
+            for slot in self._flagged_slots + self._last_swept
+        )
+        return header + bytes(cell_bytes) + slots
+
+    @classmethod
+    def from_snapshot(cls, data):
+        width, height, nb_mines, nb_flagged, nb_last_swept = (
+            _SNAPSHOT_HEADER.unpack_from(data)
+        )
+        offset = _SNAPSHOT_HEADER.size
+        cell_bytes = data[offset:offset + width * height]
+        offset += width * height
+
+        slots = [(x, y) for y in range(height) for x in range(width)]
+
+        # The size limits only apply to new boards, `init_board` accepts
+        # any size so every board that was saved can be restored
+        board = cls.__new__(cls)
+        board._dev_env = os.environ.get('MINESCRUBBER_DEV')
+        board.init_board(
+            width=width,
+            height=height,
+            nb_mines=nb_mines,
+            mine_slots=[
+                slot for slot, value in zip(slots, cell_bytes)
+                if value & _MINE_BIT
+            ],
+        )
+
+        for slot, value in zip(slots, cell_bytes):
+            cell = board.get_cell(slot)
+            state = cellar.CELL_STATE(value & _STATE_MASK)
+            if state == cellar.CELL_STATE.uncovered:
+                cell.uncover()
+            elif state == cellar.CELL_STATE.flagged:
+                cell.flag()
+            if value & _SWEPT_BIT:
+                board._swept_slots.append(slot)
+
+        slots = [
+            _SNAPSHOT_SLOT.unpack_from(data, offset + index * 2)
+            for index in range(nb_flagged + nb_last_swept)
+        ]
+        board._flagged_slots = slots[:nb_flagged]
+        board._last_swept = slots[nb_flagged:]
+        board._build_indexes()
+        return board
+
     def get_cell(self, slot):
         return self.data[slot]
 
+    def find_slots(self, state=None, hint=None):
+        return sorted(self._indexed_slots(state=state, hint=hint))
+
+    def count_slots(self, state=None, hint=None):
+        return len(self._indexed_slots(state=state, hint=hint))
+
     def get_slot(self, cell):
         return cell.slot
 
@@ -158,6 +278,7 @@ class Board:
         if cell.is_uncovered:
             return
 
+        state = cell.state
         if cell.is_flagged:
             cell.unflag()
             self._flagged_slots.remove(cell.slot)
@@ -168,10 +289,18 @@ class Board:
             cell.flag()
             self._flagged_slots.append(cell.slot)
 
+        self._update_indexes(cell, state)
+
     def uncover_all(self):
         for cell in self.cells:
             cell.uncover()
 
+        self._state_index = {
+            state: set() for state in cellar.CELL_STATE
+        }
+        self._state_index[cellar.CELL_STATE.uncovered] = set(self.slots)
+        self._frontier = set()
+
     def sweep(self, cell, is_first_call=True):
         if is_first_call:
             self._last_swept = []
@@ -186,13 +315,78 @@ class Board:
 
     def _sweep_cell(self, cell):
         if not cell.is_flagged:
+            state = cell.state
             cell.uncover()
+            self._update_indexes(cell, state)
             if cell.slot not in self._last_swept:
                 self._last_swept.append(cell.slot)
 
         if cell.slot not in self._swept_slots:
             self._swept_slots.append(cell.slot)
 
+    def _build_indexes(self):
+        self._state_index = {state: set() for state in cellar.CELL_STATE}
+        self._hint_index = collections.defaultdict(set)
+        for slot, cell in self._data.items():
+            self._state_index[cell.state].add(slot)
+            if not cell.has_mine:
+                self._hint_index[cell.hint].add(slot)
+
+        self._frontier = set()
+        for slot in self._state_index[cellar.CELL_STATE.uncovered]:
+            self._update_frontier(slot)
+
+    def _update_indexes(self, cell, old_state):
+        if cell.state == old_state:
+            return
+
+        slot = cell.slot
+        self._state_index[old_state].discard(slot)
+        self._state_index[cell.state].add(slot)
+
+        # Only this cell and its neighbours can enter or leave the frontier
+        self._update_frontier(slot)
+        if cell.is_covered:
+            # A covered cell puts every uncovered hinted neighbour on it
+            for adjacent_slot in self._neighbours[slot]:
+                adjacent_cell = self._data[adjacent_slot]
+                if adjacent_cell.is_uncovered and adjacent_cell.hint:
+                    self._frontier.add(adjacent_slot)
+        elif old_state == cellar.CELL_STATE.covered:
+            # Only neighbours already on it can leave the frontier
+            for adjacent_slot in self._neighbours[slot]:
+                if adjacent_slot in self._frontier:
+                    self._update_frontier(adjacent_slot)
+
+    def _update_frontier(self, slot):
+        cell = self._data[slot]
+        is_frontier = (
+            cell.is_uncovered and
+            bool(cell.hint) and
+            any(
+                self._data[adjacent_slot].is_covered
+                for adjacent_slot in self._neighbours[slot]
+            )
+        )
+        if is_frontier:
+            self._frontier.add(slot)
+        else:
+            self._frontier.discard(slot)
+
+    def _indexed_slots(self, state=None, hint=None):
+        if state is None and hint is None:
+            return self._data.keys()
+        elif hint is None:
+            return self._state_index[state]
+        elif state is None:
+            return self._hint_index.get(hint, set())
+
+        state_slots = self._state_index[state]
+        hint_slots = self._hint_index.get(hint, set())
+        if len(state_slots) > len(hint_slots):
+            state_slots, hint_slots = hint_slots, state_slots
+        return {slot for slot in state_slots if slot in hint_slots}
+
     def _generate_board_data(self):
         board_data = self._create_empty_board_data()
         board_data = self._setup_mines(board_data=board_data)
@@ -207,14 +401,17 @@ class Board:
         return data
 
     def _setup_mines(self, board_data):
-        # Use random seed to generate exactly the same
-        # random mines for test/dev/debug at runtime
-        if self._dev_env:
-            random.seed(50)
+        if self._mine_slots is not None:
+            self._validate_mine_slots(self._mine_slots, board_data)
+        else:
+            # Use random seed to generate exactly the same
+            # random mines for test/dev/debug at runtime
+            if self._dev_env:
+                random.seed(50)
 
-        random_slots = [slot for slot in board_data.keys()]  # Copy of keys
-        random.shuffle(random_slots)
-        self._mine_slots = random_slots[:self._nb_mines]
+            random_slots = [slot for slot in board_data.keys()]  # Copy
+            random.shuffle(random_slots)
+            self._mine_slots = random_slots[:self._nb_mines]
 
         for slot in self._mine_slots:
             cell = board_data[slot]
@@ -229,8 +426,7 @@ class Board:
                 continue
 
             hint = 0
-            adjacent_slots = self._get_adjacent_slots(slot, board_data)
-            for adjacent_slot in adjacent_slots:
+            for adjacent_slot in self._neighbours[slot]:
                 cell = board_data[adjacent_slot]
                 if cell.has_mine:
                     hint += 1
@@ -244,8 +440,10 @@ class Board:
         return board_data
 
     def _get_adjacent_cells(self, cell):
-        adjacent_slots = self._get_adjacent_slots(cell.slot, self.data)
-        return list(map(self.get_cell, adjacent_slots))
+        return [
+            self._data[adjacent_slot]
+            for adjacent_slot in self._neighbours[cell.slot]
+        ]
 
     def _get_adjacent_slots(self, slot, board_data):
         slots = board_data.keys()
@@ -274,20 +472,32 @@ class Board:
             y > self.max_y,
         ])
 
+    def __getstate__(self):
+        # The neighbour table is shared by every board of the same size,
+        # rebuild it from the cache instead of pickling a copy
+        state = self.__dict__.copy()
+        del state['_neighbours']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._neighbours = _neighbour_table(self._width, self._height)
+
     def __repr__(self):
         header = f'[{self._width} x {self._height}] ({self._nb_mines})'
         body = self.display()
         footer = ''
         return f'{header}\n{body}\n{footer}'
 
-    def _validate_args(self, width, height, nb_mines):
-        allowed_width = self.MIN_CELLS < width < self.MAX_CELLS
-        allowed_height = self.MIN_CELLS < height < self.MAX_CELLS
+    @classmethod
+    def _validate_args(cls, width, height, nb_mines):
+        allowed_width = cls.MIN_CELLS < width < cls.MAX_CELLS
+        allowed_height = cls.MIN_CELLS < height < cls.MAX_CELLS
         if not allowed_width or not allowed_height:
             error_msg = (
                 f'Both `width={width}` and '
                 f'`height={height}`` should be between '
-                f'{self.MIN_CELLS} and {self.MAX_CELLS}'
+                f'{cls.MIN_CELLS} and {cls.MAX_CELLS}'
             )
             raise RuntimeError(error_msg)
 
@@ -299,3 +509,43 @@ class Board:
                 f'(width={width} x height={height})'
             )
             raise RuntimeError(error_msg)
+
+    def _validate_mine_slots(self, mine_slots, board_data):
+        is_distinct = len(set(mine_slots)) == len(mine_slots)
+        if len(mine_slots) != self._nb_mines or not is_distinct:
+            error_msg = (
+                f'Expected {self._nb_mines} distinct mine slots, '
+                f'got {mine_slots}'
+            )
+            raise RuntimeError(error_msg)
+
+        for slot in mine_slots:
+            if slot not in board_data:
+                error_msg = f'The mine slot<{slot}> is not on board'
+                raise ValueError(error_msg)
+
+
+@functools.lru_cache(maxsize=None)
+def _neighbour_table(width, height):
+    # Adjacent slots for each slot, in the order of `_get_adjacent_slots`
+    table = {}
+    for x in range(width):
+        for y in range(height):
+            table[(x, y)] = tuple(
+                (adj_x, adj_y)
+                for adj_x in (x - 1, x, x + 1)
+                for adj_y in (y - 1, y, y + 1)
+                if (adj_x, adj_y) != (x, y) and
+                0 <= adj_x < width and 0 <= adj_y < height
+            )
+    return table
+
+
+def _flat_neighbour_table(width, height):
+    # The same neighbours as row major flat indices, y * width + x
+    table = _neighbour_table(width, height)
+    return [
+        [adj_y * width + adj_x for adj_x, adj_y in table[(x, y)]]
+        for y in range(height)
+        for x in range(width)
+    ]
@@ -0,0 +1,322 @@
+import asyncio
+import collections
+import enum
+import random
+import struct
+import sys
+import time
+
+
+from . import batcher
+from . import gamer
+
+
+@enum.unique
+class KIND(enum.Enum):
+    delta = 0
+    snapshot = 1
+
+
+MESSAGE = collections.namedtuple(
+    'MESSAGE',
+    [
+        'kind',
+        'outcome',
+        'seq',
+        'width',
+        'height',
+        'cells',  # list of (x, y, code) using the `batcher` cell codes
+    ]
+)
+
+_HEADER = struct.Struct('>BBIBBH')
+_CELL = struct.Struct('>BBb')
+_FRAME = struct.Struct('>I')
+
+
+def encode(kind, outcome, seq, width, height, cells):
+    header = _HEADER.pack(
+        kind.value,
+        outcome.value,
+        seq,
+        width,
+        height,
+        len(cells),
+    )
+    return header + b''.join(_CELL.pack(*cell) for cell in cells)
+
+
+def decode(message):
+    kind, outcome, seq, width, height, nb_cells = _HEADER.unpack_from(
+        message
+    )
+    cells = [
+        _CELL.unpack_from(message, _HEADER.size + index * _CELL.size)
+        for index in range(nb_cells)
+    ]
+    return MESSAGE(
+        kind=KIND(kind),
+        outcome=gamer.OUTCOME(outcome),
+        seq=seq,
+        width=width,
+        height=height,
+        cells=cells,
+    )
+
+
+def apply(observation, message):
+    # Patch a row major observation (see `batcher.observe_board`) in place
+    if message.kind == KIND.snapshot:
+        observation[:] = [
+            [batcher.COVERED_INT] * message.width
+            for _ in range(message.height)
+        ]
+    for x, y, code in message.cells:
+        observation[y][x] = code
+    return observation
+
+
+def _validate_max_pending(max_pending):
+    # asyncio treats a maxsize below 1 as unbounded
+    if max_pending < 1:
+        error_msg = f'max_pending={max_pending} should be at least 1'
+        raise ValueError(error_msg)
+
+
+class Subscriber:
+    def __init__(self, max_pending):
+        _validate_max_pending(max_pending)
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._nb_coalesced = 0
+
+    @property
+    def nb_pending(self):
+        return self._queue.qsize()
+
+    @property
+    def nb_coalesced(self):
+        return self._nb_coalesced
+
+    async def get(self):
+        return await self._queue.get()
+
+    def get_nowait(self):
+        return self._queue.get_nowait()
+
+    def _offer(self, message, get_snapshot):
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Slow subscriber, replace everything pending with one snapshot
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(get_snapshot())
+            self._nb_coalesced += 1
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+
+class Broadcaster:
+    def __init__(self, max_pending=64):
+        _validate_max_pending(max_pending)
+        self._max_pending = max_pending
+        self._subscribers = []
+        self._controller = None
+        self._game_id = None
+        self._seq = 0
+        self._nb_published = 0
+
+    @property
+    def subscribers(self):
+        return list(self._subscribers)
+
+    @property
+    def nb_published(self):
+        return self._nb_published
+
+    def attach(self, controller):
+        self._controller = controller
+        self._game_id = controller.game_id
+        controller.add_move_listener(self.publish_move)
+        controller.add_new_game_listener(self.publish_new_game)
+
+    def detach(self):
+        self._controller.remove_move_listener(self.publish_move)
+        self._controller.remove_new_game_listener(self.publish_new_game)
+        self._controller = None
+
+    def subscribe(self, max_pending=None):
+        if max_pending is None:
+            max_pending = self._max_pending
+        subscriber = Subscriber(max_pending=max_pending)
+        if self._controller is not None:
+            subscriber._offer(self.snapshot(), self.snapshot)
+        self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self._subscribers.remove(subscriber)
+
+    def snapshot(self):
+        board = self._controller.board
+        cells = []
+        for cell in board.cells:
+            code = batcher.cell_code(cell)
+            if code != batcher.COVERED_INT:
+                cells.append((cell.x, cell.y, code))
+        return encode(
+            KIND.snapshot,
+            self._controller.outcome,
+            self._seq,
+            board.width,
+            board.height,
+            cells,
+        )
+
+    def publish_new_game(self, game_id):
+        # Spectators see the fresh covered board before any move is made
+        self._seq += 1
+        self._game_id = game_id
+        self.publish(self.snapshot())
+
+    def publish_move(self, move):
+        self._seq += 1
+        board = self._controller.board
+        is_new_game = move.game_id != self._game_id
+        if is_new_game or move.outcome == gamer.OUTCOME.over:
+            # A new board or a fully uncovered one, send it whole
+            self._game_id = move.game_id
+            self.publish(self.snapshot())
+            return
+
+        if move.action == gamer.ACTION.flag:
+            slots = [move.slot]
+        else:
+            slots = board.last_swept
+
+        cells = []
+        for slot in slots:
+            cell = board.get_cell(slot)
+            cells.append((cell.x, cell.y, batcher.cell_code(cell)))
+
+        self.publish(encode(
+            KIND.delta,
+            move.outcome,
+            self._seq,
+            board.width,
+            board.height,
+            cells,
+        ))
+
+    def publish(self, message):
+        snapshot = []
+
+        def get_snapshot():
+            if not snapshot:
+                snapshot.append(self.snapshot())
+            return snapshot[0]
+
+        for subscriber in self._subscribers:
+            subscriber._offer(message, get_snapshot)
+        self._nb_published += 1
+
+
+async def serve_unix(broadcaster, path, max_pending=None):
+    async def handle(reader, writer):
+        subscriber = broadcaster.subscribe(max_pending=max_pending)
+        # Spectators never send anything, reading only detects hang ups
+        hung_up = asyncio.ensure_future(reader.read())
+        try:
+            while True:
+                getter = asyncio.ensure_future(subscriber.get())
+                await asyncio.wait(
+                    {getter, hung_up},
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not getter.done():
+                    getter.cancel()
+                    break
+
+                message = getter.result()
+                writer.write(_FRAME.pack(len(message)) + message)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            hung_up.cancel()
+            broadcaster.unsubscribe(subscriber)
+            writer.close()
+
+    return await asyncio.start_unix_server(handle, path=path)
+
+
+async def read_messages(reader):
+    while True:
+        try:
+            header = await reader.readexactly(_FRAME.size)
+        except asyncio.IncompleteReadError:
+            return
+        (size,) = _FRAME.unpack(header)
+        yield decode(await reader.readexactly(size))
+
+
+async def _consume(subscriber, counts, index):
+    async for _ in subscriber:
+        counts[index] += 1
+
+
+async def benchmark(nb_subscribers, nb_moves=2000, max_pending=64, seed=50):
+    rnd = random.Random(seed)
+    controller = gamer.GameController()
+    broadcaster = Broadcaster(max_pending=max_pending)
+    broadcaster.attach(controller)
+
+    subscribers = [broadcaster.subscribe() for _ in range(nb_subscribers)]
+    counts = [0] * nb_subscribers
+    consumers = [
+        asyncio.ensure_future(_consume(subscriber, counts, index))
+        for index, subscriber in enumerate(subscribers)
+    ]
+
+    board = controller.board
+    slots = list(board.slots)
+    start = time.perf_counter()
+    for _ in range(nb_moves):
+        if controller.outcome != gamer.OUTCOME.playing:
+            controller.reset((board.width, board.height, board.nb_mines))
+        slot = rnd.choice(slots)
+        if rnd.random() < 0.2:
+            controller.flag(slot)
+        else:
+            controller.select(slot)
+        await asyncio.sleep(0)
+
+    while any(subscriber.nb_pending for subscriber in subscribers):
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+
+    for consumer in consumers:
+        consumer.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+
+    nb_coalesced = sum(subscriber.nb_coalesced for subscriber in subscribers)
+    return sum(counts) / elapsed, nb_coalesced
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    subscriber_counts = [int(arg) for arg in argv] or [1, 10, 100, 1000]
+    sys.stdout.write('subscribers  deliveries/s  coalesced\n')
+    for nb_subscribers in subscriber_counts:
+        rate, nb_coalesced = asyncio.run(benchmark(nb_subscribers))
+        sys.stdout.write(
+            f'{nb_subscribers:>11}  {rate:>12.0f}  {nb_coalesced:>9}\n'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+import csv
+import gzip
+import io
+import json
+
+
+FORMATS = ('jsonl', 'csv')
+
+FIELDS = [
+    'game_id',
+    'action',
+    'x',
+    'y',
+    'nb_uncovered',
+    'elapsed',
+    'outcome',
+]
+
+
+def _guess_format(path):
+    name = str(path)
+    if name.endswith('.gz'):
+        name = name[:-len('.gz')]
+    if name.endswith('.csv'):
+        return 'csv'
+    return 'jsonl'
+
+
+def to_record(move):
+    x, y = move.slot
+    return {
+        'game_id': move.game_id,
+        'action': move.action.name,
+        'x': x,
+        'y': y,
+        'nb_uncovered': move.nb_uncovered,
+        'elapsed': round(move.elapsed, 6),
+        'outcome': move.outcome.name,
+    }
+
+
+class MoveExporter:
+    def __init__(self, path, fmt=None, compress=None, buffer_size=256):
+        self._path = path
+        self._fmt = fmt or _guess_format(path)
+        if self._fmt not in FORMATS:
+            error_msg = (
+                f'The format<{self._fmt}> is not supported: {FORMATS}'
+            )
+            raise ValueError(error_msg)
+
+        if compress is None:
+            compress = str(path).endswith('.gz')
+
+        self._compress = compress
+        self._buffer_size = max(1, buffer_size)
+        self._buffer = []
+        self._nb_written = 0
+
+        self._stream = None
+        self._was_opened = False
+        self._controllers = []
+        self._csv_line = None
+        self._csv_writer = None
+
+    @property
+    def nb_written(self):
+        return self._nb_written
+
+    @property
+    def is_open(self):
+        return self._stream is not None
+
+    def open(self):
+        if self.is_open:
+            return self
+
+        # Reopening appends so earlier records are never truncated
+        mode = 'at' if self._was_opened else 'wt'
+        if self._compress:
+            self._stream = gzip.open(self._path, mode, newline='')
+        else:
+            self._stream = open(self._path, mode, newline='')
+
+        if self._fmt == 'csv':
+            self._csv_line = io.StringIO()
+            self._csv_writer = csv.DictWriter(
+                self._csv_line,
+                fieldnames=FIELDS,
+            )
+            if not self._was_opened:
+                self._csv_writer.writeheader()
+                self._buffer.append(self._pop_csv_line())
+
+        self._was_opened = True
+        return self
+
+    def close(self):
+        for controller in list(self._controllers):
+            self.detach(controller)
+
+        if not self.is_open:
+            return
+
+        self.flush()
+        self._stream.close()
+        self._stream = None
+
+    def attach(self, controller):
+        self.open()
+        controller.add_move_listener(self.write)
+        self._controllers.append(controller)
+
+    def detach(self, controller):
+        controller.remove_move_listener(self.write)
+        self._controllers.remove(controller)
+
+    def write(self, move):
+        if not self.is_open:
+            error_msg = f'The exporter for {self._path} is closed'
+            raise RuntimeError(error_msg)
+
+        self._buffer.append(self._encode(to_record(move)))
+        self._nb_written += 1
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        self._stream.write(''.join(self._buffer))
+        self._buffer = []
+
+    def sink(self):
+        # Generator sink, prime with `next()` then `send()` moves into it
+        self.open()
+        try:
+            while True:
+                move = yield
+                self.write(move)
+        finally:
+            self.close()
+
+    def _encode(self, record):
+        if self._fmt == 'jsonl':
+            return json.dumps(record, separators=(',', ':')) + '\n'
+
+        self._csv_writer.writerow(record)
+        return self._pop_csv_line()
+
+    def _pop_csv_line(self):
+        line = self._csv_line.getvalue()
+        self._csv_line.seek(0)
+        self._csv_line.truncate()
+        return line
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def export(moves, path, fmt=None, compress=None, buffer_size=256):
+    with MoveExporter(
+        path,
+        fmt=fmt,
+        compress=compress,
+        buffer_size=buffer_size,
+    ) as exporter:
+        for move in moves:
+            exporter.write(move)
+    return exporter.nb_written
+
+
+def read_records(path, fmt=None, compress=None):
+    fmt = fmt or _guess_format(path)
+    if compress is None:
+        compress = str(path).endswith('.gz')
+
+    opener = gzip.open if compress else open
+    with opener(path, 'rt', newline='') as stream:
+        if fmt == 'csv':
+            for record in csv.DictReader(stream):
+                yield record
+        else:
+            for line in stream:
+                yield json.loads(line)
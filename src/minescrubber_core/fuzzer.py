@@ -0,0 +1,301 @@
+import argparse
+import collections
+import functools
+import multiprocessing
+import random
+import sys
+import time
+
+
+from . import batcher
+from . import boarder
+from . import gamer
+
+
+CASE = collections.namedtuple(
+    'CASE',
+    [
+        'width',
+        'height',
+        'mine_slots',
+        'moves',  # list of (ACTION, slot)
+    ]
+)
+
+MISMATCH = collections.namedtuple(
+    'MISMATCH',
+    [
+        'engine',
+        'seed',
+        'move_index',
+        'case',  # shrunk to a minimal reproducer
+        'expected',
+        'actual',
+    ]
+)
+
+REPORT = collections.namedtuple(
+    'REPORT',
+    [
+        'nb_cases',
+        'nb_moves',
+        'elapsed',
+        'moves_per_second',
+        'mismatches',
+    ]
+)
+
+
+# Chance that a select picks a mine, keeps most games alive long enough
+# to reach deep sweeps, flag limits and solved boards
+MINE_SELECT_CHANCE = 0.02
+FLAG_CHANCE = 0.25
+
+
+def available_engines():
+    engines = ['python']
+    if batcher.np is not None:
+        engines.append('numpy')
+    return engines
+
+
+def generate_case(seed):
+    rnd = random.Random(seed)
+    min_cells = boarder.Board.MIN_CELLS + 1
+    max_cells = boarder.Board.MAX_CELLS - 1
+    width = rnd.randint(min_cells, max_cells)
+    height = rnd.randint(min_cells, max_cells)
+    slots = [(x, y) for x in range(width) for y in range(height)]
+    nb_mines = rnd.randint(0, len(slots) // 4)
+    mine_slots = rnd.sample(slots, nb_mines)
+
+    safe_slots = sorted(set(slots) - set(mine_slots))
+    moves = []
+    for _ in range(rnd.randint(1, len(slots))):
+        if rnd.random() < FLAG_CHANCE:
+            moves.append((gamer.ACTION.flag, rnd.choice(slots)))
+        elif mine_slots and rnd.random() < MINE_SELECT_CHANCE:
+            moves.append((gamer.ACTION.select, rnd.choice(mine_slots)))
+        else:
+            moves.append((gamer.ACTION.select, rnd.choice(safe_slots)))
+
+    return CASE(
+        width=width,
+        height=height,
+        mine_slots=mine_slots,
+        moves=moves,
+    )
+
+
+def replay(case, engine):
+    nb_mines = len(case.mine_slots)
+    board = boarder.Board(
+        width=case.width,
+        height=case.height,
+        nb_mines=nb_mines,
+        mine_slots=case.mine_slots,
+    )
+    controller = gamer.GameController(board=board)
+
+    batch = batcher.BatchBoard(
+        nb_boards=1,
+        width=case.width,
+        height=case.height,
+        nb_mines=nb_mines,
+        auto_reset=False,
+        use_numpy=engine == 'numpy',
+    )
+    batch.set_mines(0, case.mine_slots)
+
+    for move_index, (action, slot) in enumerate(case.moves):
+        if action == gamer.ACTION.select:
+            controller.select(slot)
+        else:
+            controller.flag(slot)
+        expected = (batcher.observe_board(board), controller.outcome)
+
+        # An engine crash is a failure at this move, so it can be shrunk
+        try:
+            batch.step([batch.encode_action(action, slot)])
+            actual = (_as_list(batch.observations[0]), batch.outcomes[0])
+        except Exception as exc:
+            actual = (None, f'{type(exc).__name__}: {exc}')
+
+        if expected != actual:
+            return move_index, expected, actual
+
+    return None
+
+
+def shrink(case, engine):
+    failure = replay(case, engine)
+    if failure is None:
+        return case
+
+    # Delta debugging over the move list, halving the chunk size
+    moves = list(case.moves[:failure[0] + 1])
+    chunk_size = max(1, len(moves) // 2)
+    while True:
+        index = 0
+        while index < len(moves):
+            candidate = moves[:index] + moves[index + chunk_size:]
+            failure = candidate and replay(
+                case._replace(moves=candidate),
+                engine,
+            )
+            if failure:
+                moves = candidate[:failure[0] + 1]
+            else:
+                index += chunk_size
+
+        if chunk_size == 1:
+            break
+        chunk_size //= 2
+
+    return case._replace(moves=moves)
+
+
+def fuzz_seed(seed, engines=None):
+    case = generate_case(seed)
+    mismatches = []
+    for engine in engines or available_engines():
+        failure = replay(case, engine)
+        if failure is None:
+            continue
+
+        shrunk = shrink(case, engine)
+        move_index, expected, actual = replay(shrunk, engine)
+        mismatches.append(MISMATCH(
+            engine=engine,
+            seed=seed,
+            move_index=move_index,
+            case=shrunk,
+            expected=expected,
+            actual=actual,
+        ))
+
+    nb_moves = len(case.moves) * len(engines or available_engines())
+    return nb_moves, mismatches
+
+
+def run(duration=10.0, processes=None, seed=None, engines=None,
+        chunk_size=8, max_mismatches=1):
+    engines = engines or available_engines()
+    if seed is None:
+        seed = random.getrandbits(32)
+
+    processes = processes or multiprocessing.cpu_count()
+    round_size = processes * chunk_size
+    worker = functools.partial(fuzz_seed, engines=engines)
+
+    nb_cases = 0
+    nb_moves = 0
+    mismatches = []
+    start = time.monotonic()
+
+    def play_rounds(map_func):
+        nonlocal nb_cases, nb_moves, seed
+        while time.monotonic() - start < duration:
+            seeds = range(seed, seed + round_size)
+            seed += round_size
+            for case_moves, case_mismatches in map_func(worker, seeds):
+                nb_cases += 1
+                nb_moves += case_moves
+                mismatches.extend(case_mismatches)
+            if len(mismatches) >= max_mismatches:
+                break
+
+    if processes == 1:
+        play_rounds(map)
+    else:
+        with multiprocessing.Pool(processes=processes) as pool:
+            play_rounds(functools.partial(pool.imap_unordered,
+                                          chunksize=chunk_size))
+
+    elapsed = time.monotonic() - start
+    return REPORT(
+        nb_cases=nb_cases,
+        nb_moves=nb_moves,
+        elapsed=elapsed,
+        moves_per_second=nb_moves / elapsed if elapsed else 0.0,
+        mismatches=mismatches,
+    )
+
+
+def _as_list(observation):
+    if hasattr(observation, 'tolist'):
+        return observation.tolist()
+    return observation
+
+
+def format_mismatch(mismatch):
+    case = mismatch.case
+    moves = ', '.join(
+        f'({action.name}, {slot})' for action, slot in case.moves
+    )
+    return '\n'.join([
+        f'Mismatch in engine<{mismatch.engine}> for seed {mismatch.seed} '
+        f'at move {mismatch.move_index}',
+        f'  board: {case.width} x {case.height}',
+        f'  mine_slots: {sorted(case.mine_slots)}',
+        f'  moves: [{moves}]',
+        f'  expected outcome: {mismatch.expected[1].name}, '
+        f'actual: {_describe(mismatch.actual)}',
+    ])
+
+
+def _describe(state):
+    observation, outcome = state
+    if observation is None:
+        return f'raised {outcome}'
+    return f'outcome {outcome.name}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=(
+            'Cross-check the batch engines against the reference '
+            'Board/GameController with random move sequences'
+        )
+    )
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help='time budget in seconds')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='worker processes, defaults to cpu count')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='first seed, random when not given')
+    parser.add_argument('--engine', action='append',
+                        choices=available_engines(),
+                        help='engine to check, may be repeated')
+    parser.add_argument('--min-throughput', type=float, default=0.0,
+                        help='fail when fewer moves per second are checked')
+    args = parser.parse_args(argv)
+
+    report = run(
+        duration=args.duration,
+        processes=args.processes,
+        seed=args.seed,
+        engines=args.engine,
+    )
+
+    sys.stdout.write(
+        f'{report.nb_cases} cases, {report.nb_moves} moves in '
+        f'{report.elapsed:.2f}s ({report.moves_per_second:.0f} moves/s)\n'
+    )
+    for mismatch in report.mismatches:
+        sys.stdout.write(format_mismatch(mismatch) + '\n')
+
+    if report.mismatches:
+        return 1
+
+    if report.moves_per_second < args.min_throughput:
+        sys.stdout.write(
+            f'Throughput below target of {args.min_throughput:.0f} moves/s\n'
+        )
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,35 +1,130 @@
+import collections
+import enum
+import time
+import uuid
+
+
 from . import boarder
+from . import cellar
+
+
+@enum.unique
+class ACTION(enum.Enum):
+    select = 0
+    flag = 1
+
+
+@enum.unique
+class OUTCOME(enum.Enum):
+    playing = 0
+    over = 1
+    solved = 2
+
+
+MOVE = collections.namedtuple(
+    'MOVE',
+    [
+        'game_id',
+        'action',
+        'slot',
+        'nb_uncovered',
+        'elapsed',  # seconds since the previous move of the same game
+        'outcome',
+    ]
+)
 
 
 class GameController:
-    def __init__(self, ui):
-        self.board = boarder.Board()
+    def __init__(self, ui=None, board=None):
+        self._board_loader = None
+        self.board = board if board is not None else boarder.Board()
         self.ui = ui
-        self.ui.init_board(board=self.board)
-        self._do_wiring()
+        if self.ui is not None:
+            self.ui.init_board(board=self.board)
+            self._do_wiring()
 
         self._is_game_over = False
         self._is_game_solved = False
 
+        self._move_listeners = []
+        self._new_game_listeners = []
+        self._new_game()
+
+    @property
+    def board(self):
+        if self._board is None and self._board_loader is not None:
+            # The loader restores the board through the `board` setter,
+            # which clears the loader only once that has succeeded
+            self._board_loader()
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        self._board = board
+        self._board_loader = None
+
+    @property
+    def is_board_loaded(self):
+        return self._board is not None
+
+    @property
+    def game_id(self):
+        return self._game_id
+
+    def unload_board(self, loader):
+        self._board = None
+        self._board_loader = loader
+
+    @property
+    def outcome(self):
+        if self._is_game_over:
+            return OUTCOME.over
+        elif self._is_game_solved:
+            return OUTCOME.solved
+        return OUTCOME.playing
+
     def run(self):
         self.ui.run()
 
+    def add_move_listener(self, listener):
+        self._move_listeners.append(listener)
+
+    def remove_move_listener(self, listener):
+        self._move_listeners.remove(listener)
+
+    def add_new_game_listener(self, listener):
+        self._new_game_listeners.append(listener)
+
+    def remove_new_game_listener(self, listener):
+        self._new_game_listeners.remove(listener)
+
     def select(self, slot):
         if self._is_game_over or self._is_game_solved:
             return
 
         cell = self.board.get_cell(slot)
         if self._is_over(cell):
+            # Losing reveals every hidden cell, flagged ones included
+            nb_hidden = self.board.nb_slots - self.board.count_slots(
+                state=cellar.CELL_STATE.uncovered
+            )
             self._game_over(cell)
+            self._record_move(ACTION.select, slot, nb_hidden)
             return
 
+        covered = cellar.CELL_STATE.covered
+        nb_covered = self.board.count_slots(state=covered)
         self.board.sweep(cell)
+        nb_uncovered = nb_covered - self.board.count_slots(state=covered)
 
         if self._is_solved():
             self._game_solved()
+            self._record_move(ACTION.select, slot, nb_uncovered)
             return
 
-        self.ui.refresh(self.board, init_image=False)
+        if self.ui is not None:
+            self.ui.refresh(self.board, init_image=False)
+        self._record_move(ACTION.select, slot, nb_uncovered)
 
     def flag(self, slot):
         if self._is_game_over or self._is_game_solved:
@@ -40,16 +135,46 @@ class GameController:
 
         if self._is_solved():
             self._game_solved()
+            self._record_move(ACTION.flag, slot, nb_uncovered=0)
             return
 
-        self.ui.refresh(self.board)
+        if self.ui is not None:
+            self.ui.refresh(self.board)
+        self._record_move(ACTION.flag, slot, nb_uncovered=0)
 
     def reset(self, args):
         width, height, nb_mines = args
         self.board.init_board(width=width, height=height, nb_mines=nb_mines)
         self._is_game_over = False
         self._is_game_solved = False
-        self.ui.refresh(self.board)
+        self._new_game()
+        if self.ui is not None:
+            self.ui.refresh(self.board)
+
+    def _new_game(self):
+        self._game_id = uuid.uuid4().hex
+        self._last_move_time = time.monotonic()
+        for listener in self._new_game_listeners:
+            listener(self._game_id)
+
+    def _record_move(self, action, slot, nb_uncovered):
+        now = time.monotonic()
+        elapsed = now - self._last_move_time
+        self._last_move_time = now
+
+        if not self._move_listeners:
+            return
+
+        move = MOVE(
+            game_id=self._game_id,
+            action=action,
+            slot=slot,
+            nb_uncovered=nb_uncovered,
+            elapsed=elapsed,
+            outcome=self.outcome,
+        )
+        for listener in self._move_listeners:
+            listener(move)
 
     def _do_wiring(self):
         wiring = [
@@ -62,14 +187,18 @@ class GameController:
             wiring_method(connect_to)
 
     def _is_solved(self):
-        return self.board.mine_slots == sorted(
-            self.board.covered_slots +
-            self.board.flagged_slots
+        # Mines stay hidden until the game is over, so the board is solved
+        # once the hidden cells are exactly as many as the mines
+        nb_hidden = (
+            self.board.count_slots(state=cellar.CELL_STATE.covered) +
+            self.board.count_slots(state=cellar.CELL_STATE.flagged)
         )
+        return nb_hidden == self.board.nb_mines
 
     def _game_solved(self):
         self._is_game_solved = True
-        self.ui.game_solved(self.board)
+        if self.ui is not None:
+            self.ui.game_solved(self.board)
 
     def _is_over(self, cell):
         return cell.has_mine
@@ -77,4 +206,5 @@ class GameController:
     def _game_over(self, cell):
         self._is_game_over = True
         self.board.uncover_all()
-        self.ui.game_over(self.board)
+        if self.ui is not None:
+            self.ui.game_over(self.board)
@@ -0,0 +1,191 @@
+import collections
+import multiprocessing
+import random
+
+
+from . import boarder
+
+
+METRICS = collections.namedtuple(
+    'METRICS',
+    [
+        'bbbv',  # 3BV, minimum no. of clicks needed to clear the board
+        'nb_openings',
+        'opening_sizes',  # cells revealed by one click on each opening
+        'nb_isolated',  # numbered cells not bordering any opening
+        'nb_islands',  # connected groups of isolated numbered cells
+        'island_sizes',
+    ]
+)
+
+
+class _UnionFind:
+    __slots__ = ('_parents',)
+
+    def __init__(self, size):
+        self._parents = list(range(size))
+
+    def find(self, index):
+        parents = self._parents
+        root = index
+        while parents[root] != root:
+            root = parents[root]
+        while parents[index] != root:
+            parents[index], index = root, parents[index]
+        return root
+
+    def union(self, first, second):
+        first_root = self.find(first)
+        second_root = self.find(second)
+        if first_root != second_root:
+            self._parents[second_root] = first_root
+
+
+def measure(board):
+    width = board.width
+    height = board.height
+    size = width * height
+
+    hints = [None] * size
+    for (x, y), cell in board.data.items():
+        hints[y * width + x] = cell.hint
+
+    neighbours = boarder._flat_neighbour_table(width, height)
+
+    # Every adjacent pair is visited once, from its lower index
+    openings = _UnionFind(size)
+    is_isolated = [hint is not None and hint > 0 for hint in hints]
+    for index, hint in enumerate(hints):
+        if hint is None:
+            continue
+        for adj in neighbours[index]:
+            if adj < index:
+                continue
+            adj_hint = hints[adj]
+            if adj_hint is None:
+                continue
+            if hint == 0 and adj_hint == 0:
+                openings.union(index, adj)
+            elif hint == 0:
+                is_isolated[adj] = False
+            elif adj_hint == 0:
+                is_isolated[index] = False
+
+    islands = _UnionFind(size)
+    for index in range(size):
+        if not is_isolated[index]:
+            continue
+        for adj in neighbours[index]:
+            if adj > index and is_isolated[adj]:
+                islands.union(index, adj)
+
+    opening_sizes = collections.Counter()
+    opening_borders = collections.defaultdict(set)
+    island_sizes = collections.Counter()
+    for index, hint in enumerate(hints):
+        if hint == 0:
+            root = openings.find(index)
+            opening_sizes[root] += 1
+            opening_borders[root].update(
+                adj for adj in neighbours[index] if hints[adj]
+            )
+        elif is_isolated[index]:
+            island_sizes[islands.find(index)] += 1
+
+    # A number bordering two openings is revealed by either of them
+    for root, borders in opening_borders.items():
+        opening_sizes[root] += len(borders)
+
+    nb_isolated = sum(island_sizes.values())
+    return METRICS(
+        bbbv=len(opening_sizes) + nb_isolated,
+        nb_openings=len(opening_sizes),
+        opening_sizes=sorted(opening_sizes.values(), reverse=True),
+        nb_isolated=nb_isolated,
+        nb_islands=len(island_sizes),
+        island_sizes=sorted(island_sizes.values(), reverse=True),
+    )
+
+
+def measure_pool(boards, processes=None, chunk_size=64):
+    boards = list(boards)
+    if processes == 1:
+        pool_metrics = list(map(measure, boards))
+    else:
+        with multiprocessing.Pool(processes=processes) as pool:
+            pool_metrics = pool.map(measure, boards, chunksize=chunk_size)
+
+    for board, metrics in zip(boards, pool_metrics):
+        board.metrics = metrics
+
+    return pool_metrics
+
+
+def generate_pool(nb_boards, width=9, height=9, nb_mines=10, min_bbbv=None,
+                  max_bbbv=None, processes=None, chunk_size=64, seed=None,
+                  max_attempts=None):
+    boarder.Board._validate_args(
+        width=width,
+        height=height,
+        nb_mines=nb_mines
+    )
+    max_attempts = max_attempts or nb_boards * 100
+    seeds = random.Random(seed)
+
+    def chunks():
+        for _ in range(0, max_attempts, chunk_size):
+            yield (
+                width, height, nb_mines, chunk_size,
+                min_bbbv, max_bbbv, seeds.getrandbits(64),
+            )
+
+    if processes == 1:
+        boards = _collect(map(_generate_chunk, chunks()), nb_boards)
+    else:
+        with multiprocessing.Pool(processes=processes) as pool:
+            results = pool.imap(_generate_chunk, chunks())
+            boards = _collect(results, nb_boards)
+
+    if len(boards) < nb_boards:
+        error_msg = (
+            f'Only {len(boards)} of {nb_boards} boards had '
+            f'{min_bbbv} <= 3BV <= {max_bbbv} after '
+            f'{max_attempts} attempts'
+        )
+        raise RuntimeError(error_msg)
+
+    return boards
+
+
+def _collect(results, nb_boards):
+    boards = []
+    for chunk in results:
+        boards.extend(chunk)
+        if len(boards) >= nb_boards:
+            break
+    return boards[:nb_boards]
+
+
+def _generate_chunk(args):
+    width, height, nb_mines, count, min_bbbv, max_bbbv, seed = args
+
+    # A local generator leaves the caller's random state alone and is not
+    # overridden by the fixed MINESCRUBBER_DEV seed of `Board`
+    rnd = random.Random(seed)
+    slots = [(x, y) for x in range(width) for y in range(height)]
+
+    boards = []
+    for _ in range(count):
+        board = boarder.Board(
+            width=width,
+            height=height,
+            nb_mines=nb_mines,
+            mine_slots=rnd.sample(slots, nb_mines),
+        )
+        bbbv = board.metrics.bbbv
+        if min_bbbv is not None and bbbv < min_bbbv:
+            continue
+        if max_bbbv is not None and bbbv > max_bbbv:
+            continue
+        boards.append(board)
+    return boards
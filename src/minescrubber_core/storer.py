@@ -0,0 +1,248 @@
+import collections
+import functools
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+
+
+from . import boarder
+from . import cellar
+from . import gamer
+
+
+STORE_METRICS = collections.namedtuple(
+    'STORE_METRICS',
+    [
+        'nb_hits',
+        'nb_misses',  # moves or lookups that had to reload from disk
+        'hit_rate',
+        'nb_evictions',
+        'reload_seconds',  # total time spent reloading
+        'mean_reload_seconds',
+        'max_reload_seconds',
+        'resident_bytes',
+        'nb_resident',
+        'nb_spilled',
+        'spilled_bytes',
+    ]
+)
+
+_SLOT_SIZE = sys.getsizeof((0, 0))
+_CELL_SIZE = sys.getsizeof(cellar.Cell(x=0, y=0))
+_LIST_ITEM_SIZE = sys.getsizeof([None]) - sys.getsizeof([])
+
+
+def estimate_size(board):
+    # Cells and slots are fixed size and the indexes are a handful of
+    # sets, so this stays O(1) per board. The neighbour table is shared by
+    # every board of the same size and is left out
+    nb_slots = board.nb_slots
+    nb_listed = (
+        len(board._swept_slots) +
+        len(board._flagged_slots) +
+        len(board._last_swept)
+    )
+    indexes = (
+        list(board._state_index.values()) +
+        list(board._hint_index.values()) +
+        [board._frontier]
+    )
+    return sum([
+        sys.getsizeof(board),
+        sys.getsizeof(board.__dict__),
+        sys.getsizeof(board.data),
+        nb_slots * (_CELL_SIZE + _SLOT_SIZE),
+        sys.getsizeof([]) * 4,
+        (nb_listed + board.nb_mines) * (_LIST_ITEM_SIZE + _SLOT_SIZE),
+        sum(sys.getsizeof(index) for index in indexes),
+    ])
+
+
+class GameStore:
+    SUFFIX = '.board'
+
+    def __init__(self, memory_budget=64 * 1024 * 1024, directory=None):
+        self._memory_budget = memory_budget
+        self._owns_directory = directory is None
+        self._directory = directory or tempfile.mkdtemp(prefix='minescrubber')
+        os.makedirs(self._directory, exist_ok=True)
+
+        self._controllers = {}
+        self._listeners = {}  # game_id -> listener touching the game
+        self._resident = collections.OrderedDict()  # game_id -> size, LRU
+        self._resident_bytes = 0
+        self._spilled = {}  # game_id -> size on disk
+
+        self._nb_hits = 0
+        self._nb_misses = 0
+        self._nb_evictions = 0
+        self._reload_seconds = 0.0
+        self._max_reload_seconds = 0.0
+
+    @property
+    def memory_budget(self):
+        return self._memory_budget
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def game_ids(self):
+        return list(self._controllers)
+
+    @property
+    def resident_bytes(self):
+        return self._resident_bytes
+
+    @property
+    def metrics(self):
+        nb_lookups = self._nb_hits + self._nb_misses
+        return STORE_METRICS(
+            nb_hits=self._nb_hits,
+            nb_misses=self._nb_misses,
+            hit_rate=self._nb_hits / nb_lookups if nb_lookups else 1.0,
+            nb_evictions=self._nb_evictions,
+            reload_seconds=self._reload_seconds,
+            mean_reload_seconds=(
+                self._reload_seconds / self._nb_misses
+                if self._nb_misses else 0.0
+            ),
+            max_reload_seconds=self._max_reload_seconds,
+            resident_bytes=self.resident_bytes,
+            nb_resident=len(self._resident),
+            nb_spilled=len(self._spilled),
+            spilled_bytes=sum(self._spilled.values()),
+        )
+
+    def new_game(self, width=9, height=9, nb_mines=10):
+        board = boarder.Board(width=width, height=height, nb_mines=nb_mines)
+        return self.add(gamer.GameController(board=board))
+
+    def add(self, controller, game_id=None):
+        # The store key stays fixed even if the controller is reset later
+        game_id = game_id or controller.game_id
+        self._controllers[game_id] = controller
+
+        # Moves and resets made through a held controller count as use too
+        listener = functools.partial(self._on_played, game_id)
+        controller.add_move_listener(listener)
+        controller.add_new_game_listener(listener)
+        self._listeners[game_id] = listener
+
+        self._touch(game_id)
+        return game_id
+
+    def remove(self, game_id):
+        controller = self.get(game_id)
+        self._remove_listener(game_id)
+        del self._controllers[game_id]
+        self._resident_bytes -= self._resident.pop(game_id)
+        return controller
+
+    def get(self, game_id):
+        # A held controller reloads itself if spilled later, through the
+        # loader given to `GameController.unload_board`
+        controller = self._controllers[game_id]
+        if game_id in self._spilled:
+            self._reload(game_id)
+        else:
+            self._nb_hits += 1
+            self._touch(game_id)
+        return controller
+
+    def select(self, game_id, slot):
+        self.get(game_id).select(slot)
+
+    def flag(self, game_id, slot):
+        self.get(game_id).flag(slot)
+
+    def evict(self, game_id):
+        controller = self._controllers[game_id]
+        data = zlib.compress(controller.board.snapshot())
+        with open(self._path(game_id), 'wb') as stream:
+            stream.write(data)
+
+        controller.unload_board(functools.partial(self._reload, game_id))
+        self._resident_bytes -= self._resident.pop(game_id)
+        self._spilled[game_id] = len(data)
+        self._nb_evictions += 1
+
+    def close(self):
+        for game_id in list(self._controllers):
+            self._remove_listener(game_id)
+
+        # Held controllers of spilled games can no longer be reloaded
+        for game_id in self._spilled:
+            self._controllers[game_id].unload_board(
+                functools.partial(self._closed, game_id)
+            )
+
+        if self._owns_directory:
+            shutil.rmtree(self._directory, ignore_errors=True)
+        else:
+            for game_id in self._spilled:
+                os.remove(self._path(game_id))
+        self._controllers = {}
+        self._resident.clear()
+        self._resident_bytes = 0
+        self._spilled = {}
+
+    def _on_played(self, game_id, _):
+        self._touch(game_id)
+
+    def _remove_listener(self, game_id):
+        controller = self._controllers[game_id]
+        listener = self._listeners.pop(game_id)
+        controller.remove_move_listener(listener)
+        controller.remove_new_game_listener(listener)
+
+    def _closed(self, game_id):
+        error_msg = (
+            f'The game<{game_id}> was spilled to disk and its store is '
+            f'closed'
+        )
+        raise RuntimeError(error_msg)
+
+    def _touch(self, game_id):
+        size = estimate_size(self._controllers[game_id].board)
+        self._resident_bytes += size - self._resident.get(game_id, 0)
+        self._resident[game_id] = size
+        self._resident.move_to_end(game_id)
+
+        # Evict least recently used boards, always keeping the current one
+        while self.resident_bytes > self._memory_budget:
+            lru_game_id = next(iter(self._resident))
+            if lru_game_id == game_id:
+                break
+            self.evict(lru_game_id)
+
+    def _reload(self, game_id):
+        self._nb_misses += 1
+        start = time.perf_counter()
+        path = self._path(game_id)
+        with open(path, 'rb') as stream:
+            data = stream.read()
+
+        self._controllers[game_id].board = boarder.Board.from_snapshot(
+            zlib.decompress(data)
+        )
+        os.remove(path)
+        del self._spilled[game_id]
+
+        elapsed = time.perf_counter() - start
+        self._reload_seconds += elapsed
+        self._max_reload_seconds = max(self._max_reload_seconds, elapsed)
+        self._touch(game_id)
+
+    def _path(self, game_id):
+        return os.path.join(self._directory, f'{game_id}{self.SUFFIX}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,171 @@
+import unittest
+import random
+
+
+from minescrubber_core import batcher, boarder
+
+
+def as_list(observation):
+    if hasattr(observation, 'tolist'):
+        return observation.tolist()
+    return observation
+
+
+class TestBatchBoardPython(unittest.TestCase):
+    USE_NUMPY = False
+
+    def setUp(self):
+        random.seed(50)
+        self.width = 9
+        self.height = 7
+        self.nb_mines = 6
+        self.mine_slots = [(0, 0), (1, 0), (8, 6), (4, 3), (7, 0), (0, 6)]
+        self.batch = batcher.BatchBoard(
+            nb_boards=2,
+            width=self.width,
+            height=self.height,
+            nb_mines=self.nb_mines,
+            auto_reset=False,
+            seed=50,
+            use_numpy=self.USE_NUMPY,
+        )
+        for index in range(self.batch.nb_boards):
+            self.batch.set_mines(index, self.mine_slots)
+
+    def _select(self, slot):
+        return self.batch.encode_action(batcher.ACTION.select, slot)
+
+    def _flag(self, slot):
+        return self.batch.encode_action(batcher.ACTION.flag, slot)
+
+    def test_encode_action(self):
+        for action in batcher.ACTION:
+            code = self.batch.encode_action(action, (3, 5))
+            self.assertEqual(self.batch.decode_action(code), (action, (3, 5)))
+
+    def test_initial_observation(self):
+        observations = self.batch.observations
+        for observation in observations:
+            self.assertEqual(
+                as_list(observation),
+                [[batcher.COVERED_INT] * self.width] * self.height,
+            )
+
+    def test_select_mine(self):
+        _, rewards, dones = self.batch.step(
+            [self._select((4, 3)), self._select((8, 0))]
+        )
+        self.assertListEqual(
+            rewards,
+            [batcher.BatchBoard.REWARD_OVER, batcher.BatchBoard.REWARD_STEP],
+        )
+        self.assertListEqual(dones, [True, False])
+
+    def test_matches_reference_board(self):
+        board = boarder.Board(
+            width=self.width,
+            height=self.height,
+            nb_mines=self.nb_mines,
+        )
+        self.batch.set_mines(0, board.mine_slots)
+
+        moves = [
+            (batcher.ACTION.flag, (2, 2)),
+            (batcher.ACTION.select, (2, 2)),
+            (batcher.ACTION.select, (self.width - 1, 3)),
+            (batcher.ACTION.flag, (2, 2)),
+            (batcher.ACTION.select, (5, 5)),
+        ]
+        for action, slot in moves:
+            cell = board.get_cell(slot)
+            if action == batcher.ACTION.flag:
+                board.flag(cell)
+            elif not cell.has_mine:
+                board.sweep(cell)
+
+            observations, _, _ = self.batch.step(
+                [self.batch.encode_action(action, slot)] * 2
+            )
+            if cell.has_mine:
+                break
+
+            self.assertEqual(
+                as_list(observations[0]),
+                batcher.observe_board(board),
+            )
+
+    def test_flag_limit(self):
+        slots = [(x, 1) for x in range(self.nb_mines + 1)]
+        for slot in slots:
+            self.batch.step([self._flag(slot)] * 2)
+
+        observation = as_list(self.batch.observations[0])
+        flagged = [
+            code for row in observation for code in row
+            if code == batcher.FLAGGED_INT
+        ]
+        self.assertEqual(len(flagged), self.nb_mines)
+
+    def test_solved(self):
+        safe_slots = [
+            (x, y)
+            for x in range(self.width)
+            for y in range(self.height)
+            if (x, y) not in self.mine_slots
+        ]
+        rewards, dones = None, None
+        for slot in safe_slots:
+            _, rewards, dones = self.batch.step([self._select(slot)] * 2)
+            if dones[0]:
+                break
+
+        self.assertTrue(all(dones))
+        self.assertEqual(
+            list(rewards),
+            [batcher.BatchBoard.REWARD_SOLVED] * 2,
+        )
+
+    def test_auto_reset(self):
+        batch = batcher.BatchBoard(
+            nb_boards=1,
+            width=self.width,
+            height=self.height,
+            nb_mines=self.nb_mines,
+            seed=50,
+            use_numpy=self.USE_NUMPY,
+        )
+        batch.set_mines(0, self.mine_slots)
+        observations, _, dones = batch.step([self._select((4, 3))])
+        self.assertTrue(dones[0])
+        self.assertFalse(batch.dones[0])
+        self.assertEqual(
+            as_list(observations[0]),
+            [[batcher.COVERED_INT] * self.width] * self.height,
+        )
+
+    def test_invalid_action(self):
+        with self.assertRaises(ValueError):
+            self.batch.step([self.batch.nb_actions, 0])
+
+        with self.assertRaises(ValueError):
+            self.batch.step([0])
+
+        with self.assertRaises(ValueError):
+            self.batch.step([-1, 0])
+
+    def test_invalid_mines(self):
+        with self.assertRaises(ValueError):
+            self.batch.set_mines(0, self.mine_slots[1:])
+
+        duplicated = self.mine_slots[:-1] + [self.mine_slots[0]]
+        with self.assertRaises(ValueError):
+            self.batch.set_mines(0, duplicated)
+
+
+@unittest.skipIf(batcher.np is None, 'NumPy is not installed')
+class TestBatchBoardNumpy(TestBatchBoardPython):
+    USE_NUMPY = True
+
+
+if __name__ == "__main__":
+    unittest.main()
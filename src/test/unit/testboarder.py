@@ -3,9 +3,10 @@ import unittest
 import collections
 import random
 import hashlib
+import pickle
 
 
-from minescrubber_core import boarder
+from minescrubber_core import boarder, cellar
 
 
 TEST_SLOTS = collections.namedtuple(
@@ -69,6 +70,26 @@ def move(slot, op):
         return _shift(slot, x=1, y=1)
 
 
+def scan_frontier(board):
+    return sorted([
+        cell.slot for cell in board.cells
+        if cell.is_uncovered and cell.hint and any(
+            adj_cell.is_covered
+            for adj_cell in board._get_adjacent_cells(cell)
+        )
+    ])
+
+
+def play(board, nb_moves):
+    slots = sorted(board.slots)
+    for _ in range(nb_moves):
+        cell = board.get_cell(random.choice(slots))
+        if random.random() < 0.3:
+            board.flag(cell)
+        elif not cell.has_mine:
+            board.sweep(cell)
+
+
 class TestBoard(unittest.TestCase):
     def setUp(self):
         random.seed(50)
@@ -194,6 +215,100 @@ class TestBoard(unittest.TestCase):
             cell = self.board.get_cell(mine_slot)
             self.assertTrue(cell.has_mine)
 
+    def assert_indexes(self, board):
+        for state in cellar.CELL_STATE:
+            expected = sorted([
+                cell.slot for cell in board.cells if cell.state == state
+            ])
+            self.assertListEqual(board.find_slots(state=state), expected)
+            self.assertEqual(board.count_slots(state=state), len(expected))
+
+        for hint in range(9):
+            expected = sorted([
+                cell.slot for cell in board.cells if cell.hint == hint
+            ])
+            self.assertListEqual(board.find_slots(hint=hint), expected)
+
+            expected = sorted([
+                cell.slot for cell in board.cells
+                if cell.hint == hint and cell.is_uncovered
+            ])
+            self.assertListEqual(
+                board.find_slots(
+                    state=cellar.CELL_STATE.uncovered,
+                    hint=hint,
+                ),
+                expected,
+            )
+
+        self.assertListEqual(board.frontier_slots, scan_frontier(board))
+        self.assertEqual(board.count_slots(), board.nb_slots)
+
+    def test_indexes(self):
+        self.assert_indexes(self.board)
+        for _ in range(10):
+            play(self.board, nb_moves=5)
+            self.assert_indexes(self.board)
+
+        restored = boarder.Board.from_snapshot(self.board.snapshot())
+        self.assert_indexes(restored)
+
+        self.board.uncover_all()
+        self.assert_indexes(self.board)
+        self.assertListEqual(self.board.frontier_slots, [])
+
+    def test_neighbour_table(self):
+        board = boarder.Board(7, 6, 5)
+        for slot in board.slots:
+            self.assertListEqual(
+                [cell.slot for cell in board._get_adjacent_cells(
+                    board.get_cell(slot)
+                )],
+                board._get_adjacent_slots(slot, board.data),
+            )
+
+        flat_table = boarder._flat_neighbour_table(7, 6)
+        for x, y in board.slots:
+            self.assertListEqual(
+                flat_table[y * 7 + x],
+                [
+                    adj_y * 7 + adj_x for adj_x, adj_y in
+                    board._get_adjacent_slots((x, y), board.data)
+                ],
+            )
+
+    def test_pickle(self):
+        board = boarder.Board(9, 9, 10)
+        play(board, nb_moves=10)
+        restored = pickle.loads(pickle.dumps(board))
+        self.assertIs(restored._neighbours, board._neighbours)
+        self.assertEqual(restored.display(True), board.display(True))
+        self.assertListEqual(restored.frontier_slots, board.frontier_slots)
+
+    def test_explicit_mine_slots(self):
+        board = boarder.Board(9, 9, 2, mine_slots=[(0, 0), (1, 1)])
+        self.assertListEqual(board.mine_slots, [(0, 0), (1, 1)])
+
+        for mine_slots in [
+                [(0, 0), (0, 0), (1, 1)],
+                [(0, 0), (0, 0)],
+                [(0, 0)],
+        ]:
+            with self.assertRaises(RuntimeError):
+                boarder.Board(9, 9, 2, mine_slots=mine_slots)
+
+        with self.assertRaises(ValueError):
+            boarder.Board(9, 9, 2, mine_slots=[(0, 0), (9, 9)])
+
+    def test_indexes_after_init_board(self):
+        play(self.board, nb_moves=20)
+        self.board.init_board(width=9, height=9, nb_mines=10)
+        self.assert_indexes(self.board)
+        self.assertEqual(
+            self.board.count_slots(state=cellar.CELL_STATE.covered),
+            self.board.nb_slots,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
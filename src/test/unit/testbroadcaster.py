@@ -0,0 +1,157 @@
+import os
+import asyncio
+import unittest
+import random
+import shutil
+import tempfile
+
+
+from minescrubber_core import batcher, broadcaster, gamer
+
+
+def play(controller, nb_moves):
+    slots = sorted(controller.board.slots)
+    for _ in range(nb_moves):
+        if controller.outcome != gamer.OUTCOME.playing:
+            break
+        slot = random.choice(slots)
+        if random.random() < 0.3:
+            controller.flag(slot)
+        elif not controller.board.get_cell(slot).has_mine:
+            controller.select(slot)
+
+
+def drain(subscriber, observation):
+    nb_messages = 0
+    while subscriber.nb_pending:
+        message = broadcaster.decode(subscriber.get_nowait())
+        broadcaster.apply(observation, message)
+        nb_messages += 1
+    return nb_messages
+
+
+class TestBroadcaster(unittest.TestCase):
+    def setUp(self):
+        random.seed(50)
+        self.controller = gamer.GameController()
+        self.broadcaster = broadcaster.Broadcaster(max_pending=64)
+        self.broadcaster.attach(self.controller)
+
+    def test_encode_decode(self):
+        cells = [(0, 1, 3), (4, 2, batcher.FLAGGED_INT), (8, 8, -1)]
+        message = broadcaster.decode(
+            broadcaster.encode(
+                broadcaster.KIND.delta,
+                gamer.OUTCOME.over,
+                7,
+                9,
+                9,
+                cells,
+            )
+        )
+        self.assertEqual(message.kind, broadcaster.KIND.delta)
+        self.assertEqual(message.outcome, gamer.OUTCOME.over)
+        self.assertEqual(message.seq, 7)
+        self.assertListEqual(message.cells, cells)
+
+    def test_max_pending(self):
+        with self.assertRaises(ValueError):
+            broadcaster.Broadcaster(max_pending=0)
+
+        with self.assertRaises(ValueError):
+            self.broadcaster.subscribe(max_pending=0)
+
+    def test_deltas_rebuild_board(self):
+        async def run():
+            subscriber = self.broadcaster.subscribe()
+            observation = []
+            play(self.controller, nb_moves=40)
+            nb_messages = drain(subscriber, observation)
+            return subscriber, observation, nb_messages
+
+        subscriber, observation, nb_messages = asyncio.run(run())
+        self.assertGreater(nb_messages, 1)
+        self.assertEqual(subscriber.nb_coalesced, 0)
+        self.assertListEqual(
+            observation,
+            batcher.observe_board(self.controller.board),
+        )
+
+    def test_slow_subscriber_coalesced(self):
+        async def run():
+            slow = self.broadcaster.subscribe(max_pending=2)
+            fast = self.broadcaster.subscribe()
+            observation = []
+            play(self.controller, nb_moves=40)
+            return slow, fast, observation, drain(slow, observation)
+
+        slow, fast, observation, nb_messages = asyncio.run(run())
+        self.assertLessEqual(nb_messages, 2)
+        self.assertGreater(slow.nb_coalesced, 0)
+        self.assertEqual(fast.nb_coalesced, 0)
+        self.assertListEqual(
+            observation,
+            batcher.observe_board(self.controller.board),
+        )
+
+    def test_new_game_snapshot(self):
+        async def run():
+            subscriber = self.broadcaster.subscribe()
+            play(self.controller, nb_moves=20)
+            drain(subscriber, [])
+
+            self.controller.reset((9, 9, 10))
+            nb_pending = subscriber.nb_pending
+            reset = broadcaster.decode(subscriber.get_nowait())
+            self.controller.flag((0, 0))
+            return nb_pending, reset, broadcaster.decode(
+                subscriber.get_nowait()
+            )
+
+        nb_pending, reset, flagged = asyncio.run(run())
+        self.assertEqual(nb_pending, 1)
+        self.assertEqual(reset.kind, broadcaster.KIND.snapshot)
+        self.assertEqual(reset.outcome, gamer.OUTCOME.playing)
+        self.assertListEqual(reset.cells, [])
+        self.assertEqual(flagged.kind, broadcaster.KIND.delta)
+        self.assertListEqual(
+            flagged.cells,
+            [(0, 0, batcher.FLAGGED_INT)],
+        )
+
+    def test_serve_unix(self):
+        tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(tmp_dir, 'spectate.sock')
+
+        async def run():
+            server = await broadcaster.serve_unix(self.broadcaster, path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            messages = broadcaster.read_messages(reader)
+            first = await messages.__anext__()
+
+            self.controller.flag((0, 0))
+            second = await messages.__anext__()
+
+            writer.close()
+            while self.broadcaster.subscribers:
+                await asyncio.sleep(0.01)
+            server.close()
+            await server.wait_closed()
+            return first, second
+
+        try:
+            first, second = asyncio.run(run())
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        self.assertEqual(first.kind, broadcaster.KIND.snapshot)
+        self.assertEqual(second.kind, broadcaster.KIND.delta)
+        self.assertListEqual(second.cells, [(0, 0, batcher.FLAGGED_INT)])
+
+    def test_benchmark(self):
+        rate, _ = asyncio.run(broadcaster.benchmark(4, nb_moves=50))
+        self.assertGreater(rate, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
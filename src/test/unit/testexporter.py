@@ -0,0 +1,133 @@
+import os
+import unittest
+import random
+import shutil
+import tempfile
+
+
+from minescrubber_core import exporter, gamer
+
+
+def play(controller, nb_moves):
+    board = controller.board
+    safe_slots = [
+        cell.slot for cell in board.cells
+        if not cell.has_mine
+    ]
+    random.shuffle(safe_slots)
+    for slot in safe_slots[:nb_moves]:
+        if controller.outcome != gamer.OUTCOME.playing:
+            break
+        if slot in board.covered_slots:
+            controller.flag(slot)
+            controller.flag(slot)
+        controller.select(slot)
+    controller.select(board.mine_slots[0])
+
+
+class TestMoveExporter(unittest.TestCase):
+    def setUp(self):
+        random.seed(50)
+        self.tmp_dir = tempfile.mkdtemp()
+        self.controller = gamer.GameController()
+
+        self.moves = []
+        self.controller.add_move_listener(self.moves.append)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_moves(self):
+        play(self.controller, nb_moves=5)
+        self.assertTrue(self.moves)
+        self.assertEqual(self.moves[-1].outcome, gamer.OUTCOME.over)
+        self.assertTrue(
+            all(move.game_id == self.controller.game_id for move in self.moves)
+        )
+        self.assertTrue(all(move.elapsed >= 0 for move in self.moves))
+
+        nb_moves = len(self.moves)
+        self.controller.select(self.moves[0].slot)
+        self.assertEqual(len(self.moves), nb_moves)
+
+    def test_mine_reveals_hidden_cells(self):
+        board = self.controller.board
+        self.controller.flag(board.mine_slots[-1])
+        self.controller.select(board.mine_slots[0])
+        self.assertEqual(self.moves[-1].nb_uncovered, board.nb_slots)
+
+    def test_reset_changes_game_id(self):
+        game_id = self.controller.game_id
+        self.controller.reset((9, 9, 10))
+        self.assertNotEqual(game_id, self.controller.game_id)
+
+    def test_export_jsonl(self):
+        path = os.path.join(self.tmp_dir, 'moves.jsonl')
+        with exporter.MoveExporter(path, buffer_size=2) as move_exporter:
+            move_exporter.attach(self.controller)
+            play(self.controller, nb_moves=5)
+
+        records = list(exporter.read_records(path))
+        self.assertEqual(len(records), len(self.moves))
+        self.assertEqual(records[-1]['outcome'], 'over')
+        self.assertListEqual(
+            [(record['x'], record['y']) for record in records],
+            [move.slot for move in self.moves],
+        )
+
+    def test_move_after_close(self):
+        path = os.path.join(self.tmp_dir, 'moves.csv')
+        with exporter.MoveExporter(path) as move_exporter:
+            move_exporter.attach(self.controller)
+            play(self.controller, nb_moves=3)
+        nb_records = len(list(exporter.read_records(path)))
+
+        self.controller.reset((9, 9, 10))
+        self.controller.flag((0, 0))
+        self.assertEqual(len(list(exporter.read_records(path))), nb_records)
+
+        with self.assertRaises(RuntimeError):
+            move_exporter.write(self.moves[-1])
+
+        with move_exporter:
+            move_exporter.write(self.moves[-1])
+        records = list(exporter.read_records(path))
+        self.assertEqual(len(records), nb_records + 1)
+        self.assertEqual(records[-1]['x'], '0')
+
+    def test_export_csv_gzip(self):
+        path = os.path.join(self.tmp_dir, 'moves.csv.gz')
+        play(self.controller, nb_moves=5)
+        nb_written = exporter.export(iter(self.moves), path)
+
+        records = list(exporter.read_records(path))
+        self.assertEqual(nb_written, len(self.moves))
+        self.assertListEqual(list(records[0].keys()), exporter.FIELDS)
+        self.assertListEqual(
+            [record['action'] for record in records],
+            [move.action.name for move in self.moves],
+        )
+
+    def test_sink(self):
+        path = os.path.join(self.tmp_dir, 'moves.jsonl')
+        move_exporter = exporter.MoveExporter(path)
+        sink = move_exporter.sink()
+        next(sink)
+        play(self.controller, nb_moves=3)
+        for move in self.moves:
+            sink.send(move)
+        sink.close()
+
+        self.assertFalse(move_exporter.is_open)
+        self.assertEqual(
+            len(list(exporter.read_records(path))),
+            len(self.moves),
+        )
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            exporter.MoveExporter('moves.xml', fmt='xml')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from unittest import mock
+
+
+from minescrubber_core import batcher, fuzzer, gamer
+
+
+def _flag_without_limit(self, index, cell_index):
+    states = self._states[index]
+    if states[cell_index] == batcher._FLAGGED:
+        states[cell_index] = batcher._COVERED
+    elif states[cell_index] == batcher._COVERED:
+        states[cell_index] = batcher._FLAGGED
+
+
+class TestFuzzer(unittest.TestCase):
+    def setUp(self):
+        self.case = fuzzer.CASE(
+            width=6,
+            height=6,
+            mine_slots=[(0, 0), (5, 5)],
+            moves=(
+                [(gamer.ACTION.select, (1, 1))] +
+                [(gamer.ACTION.flag, (x, 0)) for x in range(1, 5)] +
+                [(gamer.ACTION.select, (3, 3))]
+            ),
+        )
+
+    def test_generate_case(self):
+        self.assertEqual(fuzzer.generate_case(50), fuzzer.generate_case(50))
+
+    def test_replay(self):
+        for engine in fuzzer.available_engines():
+            self.assertIsNone(fuzzer.replay(self.case, engine))
+            for seed in range(20):
+                case = fuzzer.generate_case(seed)
+                self.assertIsNone(fuzzer.replay(case, engine))
+
+    def test_shrink(self):
+        with mock.patch.object(
+                batcher.BatchBoard, '_flag_python', _flag_without_limit):
+            failure = fuzzer.replay(self.case, 'python')
+            self.assertIsNotNone(failure)
+
+            shrunk = fuzzer.shrink(self.case, 'python')
+            self.assertIsNotNone(fuzzer.replay(shrunk, 'python'))
+
+        # Exceeding the flag limit of two needs exactly three flags
+        self.assertListEqual(
+            [action for action, _ in shrunk.moves],
+            [gamer.ACTION.flag] * 3,
+        )
+
+    def test_shrink_crash(self):
+        def crash_on_third_flag(self, index, cell_index):
+            if self._nb_flagged[index] == 2:
+                raise IndexError('flag table overflow')
+            _flag_without_limit(self, index, cell_index)
+            self._nb_flagged[index] += 1
+
+        with mock.patch.object(
+                batcher.BatchBoard, '_flag_python', crash_on_third_flag):
+            nb_moves, mismatches = fuzzer.fuzz_seed(0, engines=['python'])
+            case = fuzzer.generate_case(0)
+            shrunk = fuzzer.shrink(case, 'python')
+
+        self.assertGreater(nb_moves, 0)
+        self.assertEqual(len(mismatches), 1)
+        self.assertIsNone(mismatches[0].actual[0])
+        self.assertIn('IndexError', mismatches[0].actual[1])
+        self.assertIn('raised IndexError', fuzzer.format_mismatch(
+            mismatches[0]
+        ))
+        self.assertLessEqual(len(shrunk.moves), 3)
+
+    def test_run(self):
+        report = fuzzer.run(duration=0.5, processes=1, seed=50)
+        self.assertGreater(report.nb_cases, 0)
+        self.assertGreater(report.moves_per_second, 0)
+        self.assertListEqual(report.mismatches, [])
+
+    def test_main_throughput_target(self):
+        with mock.patch('sys.stdout'):
+            exit_code = fuzzer.main([
+                '--duration', '0.2',
+                '--processes', '1',
+                '--seed', '50',
+                '--engine', 'python',
+                '--min-throughput', '1e12',
+            ])
+        self.assertEqual(exit_code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
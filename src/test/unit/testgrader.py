@@ -0,0 +1,122 @@
+import unittest
+import random
+
+
+from minescrubber_core import boarder, grader
+
+
+def reference_metrics(board):
+    revealed = set()
+    opening_sizes = []
+    for cell in board.cells:
+        if cell.hint != 0 or cell.slot in revealed:
+            continue
+
+        seen = {cell.slot}
+        stack = [cell]
+        while stack:
+            current = stack.pop()
+            if current.hint != 0:
+                continue
+            for adj_cell in board._get_adjacent_cells(current):
+                if adj_cell.slot not in seen:
+                    seen.add(adj_cell.slot)
+                    stack.append(adj_cell)
+
+        revealed.update(seen)
+        opening_sizes.append(len(seen))
+
+    nb_isolated = len([
+        cell for cell in board.cells
+        if not cell.has_mine and cell.slot not in revealed
+    ])
+    return (
+        len(opening_sizes) + nb_isolated,
+        sorted(opening_sizes, reverse=True),
+        nb_isolated,
+    )
+
+
+class TestGrader(unittest.TestCase):
+    def setUp(self):
+        random.seed(50)
+        self.boards = []
+        for _ in range(50):
+            width = random.randint(6, 15)
+            height = random.randint(6, 15)
+            nb_mines = random.randint(1, width * height // 3)
+            self.boards.append(
+                boarder.Board(width=width, height=height, nb_mines=nb_mines)
+            )
+
+    def test_measure(self):
+        for board in self.boards:
+            metrics = grader.measure(board)
+            self.assertEqual(
+                (metrics.bbbv, metrics.opening_sizes, metrics.nb_isolated),
+                reference_metrics(board),
+            )
+            self.assertEqual(metrics.nb_openings, len(metrics.opening_sizes))
+            self.assertEqual(metrics.nb_islands, len(metrics.island_sizes))
+            self.assertEqual(metrics.nb_isolated, sum(metrics.island_sizes))
+
+    def test_metrics_cached(self):
+        board = self.boards[0]
+        self.assertIs(board.metrics, board.metrics)
+
+        board.init_board(width=9, height=9, nb_mines=10)
+        self.assertEqual(board.metrics, grader.measure(board))
+
+    def test_measure_pool(self):
+        pool_metrics = grader.measure_pool(self.boards, processes=1)
+        self.assertListEqual(
+            pool_metrics,
+            [grader.measure(board) for board in self.boards],
+        )
+        for board, metrics in zip(self.boards, pool_metrics):
+            self.assertIs(board.metrics, metrics)
+
+    def test_generate_pool(self):
+        sample = sorted(
+            board.metrics.bbbv
+            for board in grader.generate_pool(20, processes=1, seed=50)
+        )
+        min_bbbv = sample[5]
+        max_bbbv = sample[14]
+
+        boards = grader.generate_pool(
+            20,
+            width=9,
+            height=9,
+            nb_mines=10,
+            min_bbbv=min_bbbv,
+            max_bbbv=max_bbbv,
+            processes=1,
+            seed=50,
+        )
+        self.assertEqual(len(boards), 20)
+        for board in boards:
+            self.assertTrue(min_bbbv <= board.metrics.bbbv <= max_bbbv)
+
+    def test_generate_pool_distinct(self):
+        state = random.getstate()
+        boards = grader.generate_pool(10, processes=1, seed=50)
+        self.assertEqual(random.getstate(), state)
+        self.assertEqual(
+            len({tuple(board.mine_slots) for board in boards}),
+            10,
+        )
+
+    def test_generate_pool_impossible_band(self):
+        with self.assertRaises(RuntimeError):
+            grader.generate_pool(
+                1,
+                min_bbbv=1000,
+                processes=1,
+                chunk_size=8,
+                max_attempts=16,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import os
+import unittest
+import random
+from unittest import mock
+
+
+from minescrubber_core import batcher, boarder, broadcaster, gamer, storer
+
+
+class TestGameStore(unittest.TestCase):
+    def setUp(self):
+        random.seed(50)
+        board_size = storer.estimate_size(boarder.Board())
+        self.store = storer.GameStore(memory_budget=board_size * 2.5)
+        self.game_ids = [self.store.new_game() for _ in range(5)]
+
+    def tearDown(self):
+        self.store.close()
+
+    def _safe_slot(self, game_id):
+        board = self.store.get(game_id).board
+        return next(
+            cell.slot for cell in board.cells
+            if cell.is_covered and not cell.has_mine
+        )
+
+    def test_budget(self):
+        metrics = self.store.metrics
+        self.assertLessEqual(metrics.resident_bytes, self.store.memory_budget)
+        self.assertEqual(metrics.nb_resident, 2)
+        self.assertEqual(metrics.nb_spilled, 3)
+        self.assertEqual(metrics.nb_evictions, 3)
+        self.assertGreater(metrics.spilled_bytes, 0)
+        self.assertEqual(
+            len(os.listdir(self.store.directory)),
+            metrics.nb_spilled,
+        )
+
+    def test_transparent_reload(self):
+        game_id = self.game_ids[0]
+        self.store.flag(game_id, (0, 0))
+        self.store.select(game_id, self._safe_slot(game_id))
+        board = self.store.get(game_id).board
+        expected = (
+            board.display(show_all=False),
+            board.display(show_all=True),
+            board.flagged_slots,
+            board.last_swept,
+        )
+
+        for other_game_id in self.game_ids[1:]:
+            self.store.get(other_game_id)
+        self.assertFalse(self.store._controllers[game_id].is_board_loaded)
+
+        controller = self.store.get(game_id)
+        board = controller.board
+        self.assertEqual(
+            (
+                board.display(show_all=False),
+                board.display(show_all=True),
+                board.flagged_slots,
+                board.last_swept,
+            ),
+            expected,
+        )
+        self.assertEqual(controller.outcome, gamer.OUTCOME.playing)
+
+        self.store.flag(game_id, (0, 0))
+        self.assertNotIn((0, 0), controller.board.flagged_slots)
+
+    def test_held_controller_reload(self):
+        game_id = self.game_ids[-1]
+        controller = self.store.get(game_id)
+        spectators = broadcaster.Broadcaster()
+        spectators.attach(controller)
+
+        self.store.new_game()
+        self.store.new_game()
+        self.assertFalse(controller.is_board_loaded)
+
+        controller.flag((0, 0))
+        self.assertTrue(controller.is_board_loaded)
+        self.assertListEqual(controller.board.flagged_slots, [(0, 0)])
+        self.assertEqual(self.store.metrics.nb_misses, 1)
+        self.assertLessEqual(
+            self.store.resident_bytes,
+            self.store.memory_budget,
+        )
+
+        self.store.new_game()
+        self.store.new_game()
+        self.assertFalse(controller.is_board_loaded)
+        message = broadcaster.decode(spectators.snapshot())
+        self.assertListEqual(
+            message.cells,
+            [(0, 0, batcher.FLAGGED_INT)],
+        )
+
+    def test_held_controller_stays_resident(self):
+        idle_game_id, game_id = self.game_ids[-2:]
+        controller = self.store.get(idle_game_id)
+        self.store.get(game_id)
+        for x in range(5):
+            controller.flag((x, 0))
+
+        self.assertEqual(
+            self.store._resident[idle_game_id],
+            storer.estimate_size(controller.board),
+        )
+
+        self.store.new_game()
+        self.assertTrue(controller.is_board_loaded)
+        self.assertFalse(self.store._controllers[game_id].is_board_loaded)
+
+    def test_failed_reload(self):
+        game_id = self.game_ids[-1]
+        controller = self.store.get(game_id)
+        controller.reset((16, 16, 40))
+        controller.flag((15, 15))
+        self.store.evict(game_id)
+
+        with mock.patch.object(
+                boarder.Board, 'from_snapshot', side_effect=OSError):
+            with self.assertRaises(OSError):
+                controller.board
+
+        self.assertFalse(controller.is_board_loaded)
+        self.assertEqual(controller.board.width, 16)
+        self.assertListEqual(controller.board.flagged_slots, [(15, 15)])
+
+    def test_held_controller_after_close(self):
+        controller = self.store.get(self.game_ids[0])
+        self.store.get(self.game_ids[-1])
+        self.store.get(self.game_ids[-2])
+        self.assertFalse(controller.is_board_loaded)
+        self.store.close()
+        with self.assertRaises(RuntimeError):
+            controller.flag((0, 0))
+
+    def test_metrics(self):
+        self.store.get(self.game_ids[-1])
+        self.store.get(self.game_ids[0])
+        metrics = self.store.metrics
+        self.assertEqual(metrics.nb_hits, 1)
+        self.assertEqual(metrics.nb_misses, 1)
+        self.assertEqual(metrics.hit_rate, 0.5)
+        self.assertGreater(metrics.max_reload_seconds, 0)
+
+    def test_remove(self):
+        controller = self.store.remove(self.game_ids[0])
+        self.assertIsNotNone(controller.board)
+        self.assertNotIn(self.game_ids[0], self.store.game_ids)
+
+    def test_close(self):
+        directory = self.store.directory
+        self.store.close()
+        self.assertFalse(os.path.exists(directory))
+
+
+class TestBoardSnapshot(unittest.TestCase):
+    def test_snapshot(self):
+        random.seed(50)
+        for _ in range(20):
+            controller = gamer.GameController()
+            slots = sorted(controller.board.slots)
+            for _ in range(20):
+                slot = random.choice(slots)
+                if random.random() < 0.3:
+                    controller.flag(slot)
+                else:
+                    controller.select(slot)
+
+            board = controller.board
+            restored = boarder.Board.from_snapshot(board.snapshot())
+            self.assertEqual(restored.display(False), board.display(False))
+            self.assertEqual(restored.display(True), board.display(True))
+            self.assertEqual(restored.flagged_slots, board.flagged_slots)
+            self.assertEqual(restored.last_swept, board.last_swept)
+            self.assertEqual(
+                sorted(restored._swept_slots),
+                sorted(board._swept_slots),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()